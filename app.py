@@ -62,6 +62,7 @@ import re
 import time
 from datetime import date, timedelta, datetime
 from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
 
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
@@ -363,8 +364,11 @@ def upload_processed(file_path: Path, prop_kind: str):
 
 # ==================== 날짜 유틸 ====================
 
+_KST = ZoneInfo("Asia/Seoul")
+
+
 def today_kst() -> date:
-    return (datetime.utcnow() + timedelta(hours=9)).date()
+    return datetime.now(_KST).date()
 
 
 def month_first(d: date) -> date:
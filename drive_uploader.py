@@ -5,14 +5,29 @@ Google Shared Drive 파일 업로드 모듈
 - 파일 업로드 (Shared Drive 지원)
 """
 import os
+import sys
 import json
+import atexit
+import logging
+import queue
+import random
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional, Dict, Tuple
+from types import MappingProxyType
+from typing import Optional, Dict, Tuple, List
+import httplib2
 from google.oauth2 import service_account
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaIoBaseUpload
 from googleapiclient.errors import HttpError
 
+logger = logging.getLogger(__name__)
+
 # ==================== 설정 ====================
 # 서비스 계정 정보
 # 이메일: naver-crawling-476404@appspot.gserviceaccount.com
@@ -28,28 +43,183 @@ SERVICE_ACCOUNT_FILE = os.getenv(
 # GDRIVE_FOLDER_ID는 "부동산자료" 폴더의 ID입니다
 GDRIVE_FOLDER_ID = os.getenv("GDRIVE_FOLDER_ID", "0APa-MWwUseXzUk9PVA")
 
-# Shared Drive ID는 폴더 정보에서 가져오지만, 파라미터로 사용하지 않음
+# Shared Drive ID는 폴더 정보에서 가져오지만, 기본적으로 파라미터로 사용하지 않음
 # 상위 폴더 ID(GDRIVE_FOLDER_ID)만으로 하위 폴더 접근 가능
-SHARED_DRIVE_ID = None  # 사용하지 않음
+# DRIVE_LIST_USE_DRIVE_ID=1로 명시한 경우에만 files().list()에 driveId/corpora='drive'를 넣는다.
+# (GOOGLE_SHARED_DRIVE_ID는 Actions secret에 이미 있으므로 그것만으로는 켜지 않음)
+SHARED_DRIVE_ID = (
+    os.getenv("GOOGLE_SHARED_DRIVE_ID") or None
+    if os.getenv("DRIVE_LIST_USE_DRIVE_ID", "0") == "1" else None
+)
 
 # 부모 폴더 경로
 # GDRIVE_FOLDER_ID가 "부동산자료" 폴더이므로, 그 하위의 "부동산 실거래자료"만 찾으면 됩니다
-PARENT_FOLDER_PATH = ["부동산 실거래자료"]
+# 공유 드라이브 루트에서 시작하는 경우 GDRIVE_PARENT_PATH="부동산자료/부동산 실거래자료" 처럼 지정
+DEFAULT_PARENT_FOLDER_PATH = ["부동산 실거래자료"]
+PARENT_FOLDER_PATH = [
+    p.strip() for p in os.getenv("GDRIVE_PARENT_PATH", "").split("/") if p.strip()
+] or DEFAULT_PARENT_FOLDER_PATH  # 비어 있거나 "/"만 있으면 기본 경로 사용
 
 # Google Drive API 스코프
 SCOPES = ['https://www.googleapis.com/auth/drive']
 
+# 병렬 업로드 시 초당 요청 수 상한 (Drive 사용자별 쓰기 한도 ~10회/초 아래로 유지)
+UPLOAD_RATE_PER_SEC = float(os.getenv("DRIVE_UPLOAD_RATE_PER_SEC", "8"))
+
+# Drive API HTTP 타임아웃(초)
+HTTP_TIMEOUT = int(os.getenv("DRIVE_HTTP_TIMEOUT", "120"))
+
+
+def _build_drive(creds):
+    """연결을 유지하는 httplib2.Http 하나를 묶어 Drive 서비스 생성
+
+    httplib2.Http는 스레드 안전하지 않으므로 스레드마다 이 함수로 따로 만든다.
+    같은 스레드의 호출은 모두 같은 TCP/TLS 연결을 재사용한다.
+    """
+    http = AuthorizedHttp(creds, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+    # 라이브러리에 포함된 discovery 문서를 사용해 네트워크 조회를 생략
+    return build('drive', 'v3', http=http, static_discovery=True, cache_discovery=False)
+
+# 일시적인 오류로 보고 재시도할 HTTP 상태 코드
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# 재시도 대기 상한(초)
+RETRY_MAX_WAIT = 60
+
+# 파일명 형식: "{섹션명} YYYYMM.xlsx"
+_MONTH_RE = re.compile(r'(\d{4})(\d{2})\.xlsx$')
+
+# 폴더 ID 캐시 파일 (Drive 폴더 ID는 바뀌지 않으므로 실행 간에 재사용)
+FOLDER_CACHE_FILE = Path(os.getenv(
+    "DRIVE_FOLDER_CACHE_FILE",
+    str(Path.home() / ".cache" / "molit_folder_cache.json")
+))
+
+# 이 크기 이하 파일은 resumable 세션 없이 multipart 한 번으로 업로드
+RESUMABLE_THRESHOLD = 5 * 1024 * 1024
+# resumable 업로드 청크 크기 (기본 100KB는 PUT 요청이 너무 많음)
+UPLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+
+# existing_files()에서 한 번의 쿼리에 넣을 파일명 수 (쿼리 길이 제한 대비)
+EXISTS_QUERY_CHUNK = 50
+# snapshot_sections()에서 한 번의 쿼리에 묶을 섹션 폴더 수
+SNAPSHOT_PARENTS_CHUNK = 20
+
+
+def _escape_query(value: str) -> str:
+    """Drive 검색 쿼리 문자열 리터럴용 이스케이프"""
+    return value.replace('\\', '\\\\').replace("'", "\\'")
+
+# 로그 레벨 (DEBUG로 두면 [DEBUG] 상세 로그 출력)
+LOG_LEVEL = os.getenv("DRIVE_LOG_LEVEL", "INFO").upper()
+
+_log_listener: Optional[QueueListener] = None
+
+
+def _setup_logging():
+    """모듈 로거 설정
+
+    앱에서 로깅을 따로 설정하지 않은 경우에만 stdout 핸들러를 붙인다.
+    실제 출력은 QueueListener 스레드가 하므로 업로드 스레드가 stdout 락을 기다리지 않는다.
+    """
+    global _log_listener
+    # 레벨은 핸들러 설정 여부와 관계없이 모듈 로거에 직접 지정
+    # (download_realdata.py처럼 앱이 로깅을 설정한 뒤 import해도 DRIVE_LOG_LEVEL이 적용되도록)
+    logger.setLevel(LOG_LEVEL if isinstance(logging.getLevelName(LOG_LEVEL), int) else 'INFO')
+    if _log_listener is not None or logger.handlers or logging.getLogger().handlers:
+        return
+    
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    _log_listener = QueueListener(log_queue, handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+    
+    logger.addHandler(QueueHandler(log_queue))
+    logger.propagate = False
+
+# 폴더 검색 쿼리 공통 조건
+_FOLDER_SUFFIX = " and mimeType='application/vnd.google-apps.folder' and trashed=false"
+
+# files().list() 공통 파라미터
+# DRIVE_LIST_USE_DRIVE_ID=1일 때만 공유 드라이브 범위로 검색 (기본은 driveId를 절대 넘기지 않음)
+_LIST_PARAMS_BASE = MappingProxyType({
+    'supportsAllDrives': True,
+    'includeItemsFromAllDrives': True,
+    **({'driveId': SHARED_DRIVE_ID, 'corpora': 'drive'} if SHARED_DRIVE_ID else {}),
+})
+
+
+def _folder_query(folder_name: str, parent_folder_id: str = None) -> str:
+    """폴더 이름 검색 쿼리"""
+    if parent_folder_id:
+        return f"name='{_escape_query(folder_name)}' and '{parent_folder_id}' in parents{_FOLDER_SUFFIX}"
+    return f"name='{_escape_query(folder_name)}'{_FOLDER_SUFFIX}"
+
+
+def _retry_delay(e: HttpError, attempt: int) -> float:
+    """재시도 대기 시간: Retry-After 헤더 우선, 없으면 2**attempt + 지터"""
+    retry_after = e.resp.get('retry-after') if e.resp is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), RETRY_MAX_WAIT)
+        except ValueError:
+            pass
+    return min(2 ** attempt + random.random(), RETRY_MAX_WAIT)
+
+
+class _RateLimiter:
+    """여러 스레드에서 공유하는 간단한 초당 호출 수 제한기"""
+
+    def __init__(self, rate_per_sec: float):
+        self._interval = 1.0 / rate_per_sec if rate_per_sec > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            wait_time = self._next_at - now
+            self._next_at = max(now, self._next_at) + self._interval
+        if wait_time > 0:
+            time.sleep(wait_time)
+
 
 class DriveUploader:
     """Google Drive 파일 업로드 클래스"""
     
     def __init__(self):
-        self.drive = None
-        self._folder_cache: Dict[str, str] = {}  # 폴더명 -> 폴더ID 캐시
+        _setup_logging()
+        self._creds = None
+        self._local = threading.local()  # googleapiclient 클라이언트는 스레드 안전하지 않으므로 스레드별 보관
+        self._children: Dict[str, Dict[str, str]] = self._load_folder_cache()  # 부모ID -> {폴더명: 폴더ID}
+        # 병렬 업로드 중 같은 폴더 중복 생성 방지 + _children 변경 보호
+        # (get_or_create_folder가 잡은 상태에서 _cache_folder가 다시 잡으므로 RLock)
+        self._folder_lock = threading.RLock()
+        self._path_ids_cache: Optional[Dict[str, str]] = None  # get_folder_path_ids 결과 캐시
+        self._section_snapshots: Dict[str, Dict[str, str]] = {}  # 섹션명 -> {파일명: 파일ID}
+        self._rate_limiter = _RateLimiter(UPLOAD_RATE_PER_SEC)
         self._initialized = False
     
+    @property
+    def drive(self):
+        """현재 스레드의 Drive 서비스 (다른 스레드에서는 처음 사용할 때 새로 생성)"""
+        drive = getattr(self._local, 'drive', None)
+        if drive is None and self._creds is not None:
+            drive = _build_drive(self._creds)
+            self._local.drive = drive
+        return drive
+    
+    @drive.setter
+    def drive(self, value):
+        self._local.drive = value
+    
     def init_service(self):
-        """Google Drive API 서비스 초기화"""
+        """Google Drive API 서비스 초기화
+
+        인증 정보는 여기서 한 번만 파싱해 self._creds로 보관하고,
+        스레드별 Drive 서비스는 모두 이 인증 정보를 재사용한다.
+        """
         if self._initialized:
             return True
             
@@ -75,61 +245,116 @@ class DriveUploader:
                     "또는 GOOGLE_SERVICE_ACCOUNT_JSON 환경 변수를 설정하세요."
                 )
             
-            self.drive = build('drive', 'v3', credentials=creds)
+            self._creds = creds
+            self.drive = _build_drive(creds)
             self._initialized = True
             return True
         except Exception as e:
-            print(f"❌ Google Drive API 초기화 실패: {e}")
+            logger.error(f"❌ Google Drive API 초기화 실패: {e}")
             return False
     
+    @staticmethod
+    def _load_folder_cache() -> Dict[str, Dict[str, str]]:
+        """디스크에 저장된 폴더 ID 캐시 읽기"""
+        try:
+            data = json.loads(FOLDER_CACHE_FILE.read_text(encoding='utf-8'))
+            if isinstance(data, dict):
+                return {k: dict(v) for k, v in data.items() if isinstance(v, dict)}
+        except (OSError, ValueError):
+            pass
+        return {}
+    
+    def save_folder_cache(self):
+        """폴더 ID 캐시를 디스크에 저장 (get_uploader() 인스턴스는 종료 시 자동 호출)"""
+        try:
+            FOLDER_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with self._folder_lock:
+                snapshot = {k: dict(v) for k, v in self._children.items()}
+            data = json.dumps(snapshot, ensure_ascii=False)
+            FOLDER_CACHE_FILE.write_text(data, encoding='utf-8')
+        except OSError as e:
+            logger.warning(f"  ⚠️  폴더 캐시 저장 실패: {e}")
+    
+    def _cache_folder(self, parent_folder_id: Optional[str], folder_name: str, folder_id: str):
+        with self._folder_lock:
+            self._children.setdefault(parent_folder_id or 'root', {})[folder_name] = folder_id
+    
+    def _ensure_service(self) -> bool:
+        """처음 실제로 API를 쓸 때 서비스 초기화"""
+        return self._initialized or self.init_service()
+    
+    def _execute_with_retry(self, request, max_attempts: int = 5):
+        """API 요청 실행 (429/5xx는 지수 백오프 후 재시도)"""
+        for attempt in range(1, max_attempts + 1):
+            try:
+                return request.execute()
+            except HttpError as e:
+                if e.resp.status not in RETRY_STATUS or attempt == max_attempts:
+                    raise
+                wait_time = _retry_delay(e, attempt)
+                logger.warning(f"  ⏳ HTTP {e.resp.status}, {wait_time:.1f}초 후 재시도 ({attempt}/{max_attempts})...")
+                time.sleep(wait_time)
+    
+    def _list_params(self, query: str, fields: str, page_token: str = None, page_size: int = None) -> Dict:
+        """files().list() 공통 파라미터 구성"""
+        params = {**_LIST_PARAMS_BASE, 'q': query, 'fields': fields}
+        
+        if page_size is None and 'nextPageToken' in fields:
+            page_size = 1000  # 최대 1000개
+        if page_size:
+            params['pageSize'] = page_size
+        
+        if page_token:
+            params['pageToken'] = page_token
+        
+        return params
+    
+    def _iter_files(self, query: str, fields: str = 'files(id, name)'):
+        """files().list() 결과를 페이지 단위로 넘기며 항목을 하나씩 반환 (nextPageToken 처리)"""
+        page_token = None
+        while True:
+            params = self._list_params(query, f'nextPageToken, {fields}', page_token)
+            results = self._execute_with_retry(self.drive.files().list(**params))
+            yield from results.get('files', [])
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                return
+    
     def find_folder_by_name(self, folder_name: str, parent_folder_id: str = None) -> Optional[str]:
         """폴더 이름으로 폴더 ID 찾기"""
+        # 캐시 확인
+        cached = self._children.get(parent_folder_id or 'root', {}).get(folder_name)
+        if cached:
+            return cached
+        
+        if not self._ensure_service():
+            return None
+        
         try:
-            # 캐시 확인
-            cache_key = f"{parent_folder_id or 'root'}:{folder_name}"
-            if cache_key in self._folder_cache:
-                return self._folder_cache[cache_key]
-            
-            # 검색 쿼리 구성
-            query = f"name='{folder_name}' and mimeType='application/vnd.google-apps.folder' and trashed=false"
-            
-            if parent_folder_id:
-                query += f" and '{parent_folder_id}' in parents"
-            
-            params = {
-                'q': query,
-                'fields': 'files(id, name)',
-                'supportsAllDrives': True,
-                'includeItemsFromAllDrives': True,
-            }
+            # 첫 번째 결과만 사용하므로 1건만 요청
+            params = self._list_params(_folder_query(folder_name, parent_folder_id), 'files(id)', page_size=1)
             
-            # files().list()에서 parent_folder_id 조건이 있으면
-            # 해당 폴더 내에서만 검색하므로 driveId 불필요
-            # supportsAllDrives와 includeItemsFromAllDrives만으로 충분
-            # driveId는 절대 파라미터로 전달하지 않음!
-            
-            results = self.drive.files().list(**params).execute()
+            results = self._execute_with_retry(self.drive.files().list(**params))
             items = results.get('files', [])
             
             if items:
                 folder_id = items[0]['id']
-                self._folder_cache[cache_key] = folder_id
+                self._cache_folder(parent_folder_id, folder_name, folder_id)
                 return folder_id
             
             return None
-        except HttpError as e:
-            print(f"  ❌ 폴더 검색 실패: {e}")
-            import traceback
-            traceback.print_exc()
+        except HttpError:
+            logger.exception("  ❌ 폴더 검색 실패: %s (부모: %s)", folder_name, parent_folder_id)
             return None
-        except Exception as e:
-            print(f"  ❌ 폴더 검색 중 예외 발생: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("  ❌ 폴더 검색 중 예외 발생: %s (부모: %s)", folder_name, parent_folder_id)
             return None
     
     def create_folder(self, folder_name: str, parent_folder_id: str = None) -> Optional[str]:
         """폴더 생성"""
+        if not self._ensure_service():
+            return None
+        
         try:
             file_metadata = {
                 'name': folder_name,
@@ -141,101 +366,149 @@ class DriveUploader:
             
             params = {
                 'body': file_metadata,
-                'fields': 'id, name',
+                'fields': 'id',
                 'supportsAllDrives': True,  # Shared Drive 지원 필수
             }
             
             # files().create()에는 driveId 파라미터가 없음
             # supportsAllDrives만으로 충분함
             
-            folder = self.drive.files().create(**params).execute()
+            folder = self._execute_with_retry(self.drive.files().create(**params))
             folder_id = folder.get('id')
             
             # 캐시에 저장
-            cache_key = f"{parent_folder_id or 'root'}:{folder_name}"
-            self._folder_cache[cache_key] = folder_id
+            self._cache_folder(parent_folder_id, folder_name, folder_id)
             
             return folder_id
         except HttpError as e:
-            print(f"  ❌ 폴더 생성 실패: {e}")
+            logger.error(f"  ❌ 폴더 생성 실패: {e}")
             return None
     
     def get_or_create_folder(self, folder_name: str, parent_folder_id: str = None) -> Optional[str]:
         """폴더 찾기 또는 생성"""
-        # 먼저 찾기 시도
-        folder_id = self.find_folder_by_name(folder_name, parent_folder_id)
-        
-        if folder_id:
-            return folder_id
-        
-        # 없으면 생성
-        return self.create_folder(folder_name, parent_folder_id)
+        with self._folder_lock:
+            # 먼저 찾기 시도
+            folder_id = self.find_folder_by_name(folder_name, parent_folder_id)
+            
+            if folder_id:
+                return folder_id
+            
+            # 없으면 생성
+            return self.create_folder(folder_name, parent_folder_id)
     
     def get_folder_path_ids(self) -> Optional[Dict[str, str]]:
-        """부모 폴더 경로의 각 폴더 ID 가져오기"""
+        """부모 폴더 경로의 각 폴더 ID 가져오기 (성공 결과는 인스턴스에 캐시)"""
+        if self._path_ids_cache is not None:
+            return self._path_ids_cache
+        
+        if not self._ensure_service():
+            return None
+        
         folder_ids = {}
         
         # GDRIVE_FOLDER_ID가 "부동산자료" 폴더 ID이므로 이를 시작점으로 사용
         current_parent = GDRIVE_FOLDER_ID
         
-        # "부동산자료" 폴더 정보 확인
+        # "부동산자료" 폴더 정보 확인과 첫 번째 하위 폴더 검색은 서로 의존하지 않으므로
+        # 배치 요청 하나로 함께 보낸다.
         # 상위 폴더 ID만으로 하위 폴더 접근 가능하므로 driveId 파라미터 불필요
+        responses = {}
+        
+        def _on_response(request_id, response, exception):
+            responses[request_id] = (response, exception)
+        
+        batch = self.drive.new_batch_http_request(callback=_on_response)
+        batch.add(self.drive.files().get(
+            fileId=GDRIVE_FOLDER_ID,
+            fields='id, name',
+            supportsAllDrives=True
+        ), request_id='root')
+        
+        first_name = PARENT_FOLDER_PATH[0] if PARENT_FOLDER_PATH else None
+        if first_name and not self._children.get(current_parent, {}).get(first_name):
+            params = self._list_params(_folder_query(first_name, current_parent), 'files(id)', page_size=1)
+            batch.add(self.drive.files().list(**params), request_id='first')
+        
         try:
-            folder_info = self.drive.files().get(
-                fileId=GDRIVE_FOLDER_ID,
-                fields='id, name',
-                supportsAllDrives=True
-                # 상위 폴더 ID만으로 하위 폴더 접근 가능
-                # driveId 파라미터는 사용하지 않음
-            ).execute()
-            
-            print(f"  ✅ 부동산자료 폴더 확인: {folder_info.get('name')} (ID: {GDRIVE_FOLDER_ID})")
+            self._execute_with_retry(batch)
+            folder_info, error = responses.get('root', (None, None))
+            if error is not None or folder_info is None:
+                raise error or RuntimeError("응답 없음")
+            
+            logger.info(f"  ✅ 부동산자료 폴더 확인: {folder_info.get('name')} (ID: {GDRIVE_FOLDER_ID})")
         except Exception as e:
-            print(f"  ❌ 부동산자료 폴더 접근 실패: {e}")
+            logger.error(f"  ❌ 부동산자료 폴더 접근 실패: {e}")
             return None
         
+        # 첫 번째 하위 폴더 검색 결과는 캐시에 넣어 아래 루프에서 바로 사용
+        # (실패했거나 없으면 루프에서 다시 찾거나 생성)
+        found, error = responses.get('first', (None, None))
+        if error is None and found and found.get('files'):
+            self._cache_folder(current_parent, first_name, found['files'][0]['id'])
+        
         # "부동산 실거래자료" 폴더 찾기
         for folder_name in PARENT_FOLDER_PATH:
-            folder_id = self.find_folder_by_name(folder_name, current_parent)
+            # 폴더가 없으면 생성
+            folder_id = self.get_or_create_folder(folder_name, current_parent)
             
             if not folder_id:
-                # 폴더가 없으면 생성
-                folder_id = self.create_folder(folder_name, current_parent)
-            
-            if not folder_id:
-                print(f"❌ 폴더 경로를 찾거나 생성할 수 없습니다: {folder_name}")
+                logger.error(f"❌ 폴더 경로를 찾거나 생성할 수 없습니다: {folder_name}")
                 return None
             
             folder_ids[folder_name] = folder_id
             current_parent = folder_id
         
+        self._path_ids_cache = folder_ids
         return folder_ids
     
-    def upload_file(self, local_file_path: Path, file_name: str, section_folder_name: str, max_retries: int = 3) -> Optional[str]:
-        """파일 업로드 (재시도 로직 포함)"""
-        if not self.drive:
-            print("❌ Drive 서비스가 초기화되지 않았습니다.")
+    def invalidate_path_cache(self):
+        """폴더 경로/폴더 ID 캐시 초기화 (Drive에서 폴더를 옮기거나 지운 경우)"""
+        with self._folder_lock:
+            self._path_ids_cache = None
+            self._children.clear()
+            self._section_snapshots.clear()
+    
+    def upload_file(
+        self,
+        local_file_path: Path,
+        file_name: str,
+        section_folder_name: str = None,
+        max_retries: int = 3,
+        *,
+        section_folder_id: Optional[str] = None,
+    ) -> Optional[str]:
+        """파일 업로드 (재시도 로직 포함)
+
+        section_folder_id를 알고 있으면 (예: get_section_folder_id() 결과)
+        폴더 경로 확인을 건너뛰고 바로 업로드한다.
+        """
+        if not section_folder_name and not section_folder_id:
+            raise ValueError("section_folder_name 또는 section_folder_id가 필요합니다.")
+        
+        if not self._ensure_service():
+            logger.error("❌ Drive 서비스가 초기화되지 않았습니다.")
             return None
         
         # 파일 크기 확인
         file_size = local_file_path.stat().st_size
-        print(f"  📤 파일 업로드 시작: {file_name} ({file_size:,} bytes)")
+        logger.info(f"  📤 파일 업로드 시작: {file_name} ({file_size:,} bytes)")
         
         for attempt in range(1, max_retries + 1):
             try:
-                # 1. 부모 폴더 경로 확인
-                path_ids = self.get_folder_path_ids()
-                if not path_ids:
-                    print(f"  ⚠️  폴더 경로를 찾을 수 없습니다.")
-                    return None
-                
-                # 2. 섹션별 폴더 찾기 또는 생성
-                section_parent_id = path_ids[PARENT_FOLDER_PATH[-1]]  # "부동산 실거래자료" 폴더 ID
-                section_folder_id = self.get_or_create_folder(section_folder_name, section_parent_id)
-                
                 if not section_folder_id:
-                    print(f"  ❌ 섹션 폴더를 찾거나 생성할 수 없습니다: {section_folder_name}")
-                    return None
+                    # 1. 부모 폴더 경로 확인
+                    path_ids = self.get_folder_path_ids()
+                    if not path_ids:
+                        logger.warning(f"  ⚠️  폴더 경로를 찾을 수 없습니다.")
+                        return None
+                    
+                    # 2. 섹션별 폴더 찾기 또는 생성
+                    section_parent_id = path_ids[PARENT_FOLDER_PATH[-1]]  # "부동산 실거래자료" 폴더 ID
+                    section_folder_id = self.get_or_create_folder(section_folder_name, section_parent_id)
+                    
+                    if not section_folder_id:
+                        logger.error(f"  ❌ 섹션 폴더를 찾거나 생성할 수 없습니다: {section_folder_name}")
+                        return None
                 
                 # 3. 파일 업로드
                 file_metadata = {
@@ -243,86 +516,117 @@ class DriveUploader:
                     'parents': [section_folder_id],
                 }
                 
-                media = MediaFileUpload(
-                    str(local_file_path),
-                    mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-                    resumable=True
-                )
-                
-                params = {
-                    'body': file_metadata,
-                    'media_body': media,
-                    'fields': 'id, name, webViewLink, size',
-                    'supportsAllDrives': True,  # Shared Drive 지원 필수
-                }
-                
                 if attempt > 1:
-                    print(f"  🔄 재시도 {attempt}/{max_retries}...")
+                    logger.info(f"  🔄 재시도 {attempt}/{max_retries}...")
                 
-                file = self.drive.files().create(**params).execute()
+                # 업로드가 끝나면 파일 핸들을 바로 닫음 (Windows에서 파일 잠김 방지)
+                with open(local_file_path, 'rb') as fh:
+                    resumable = file_size > RESUMABLE_THRESHOLD
+                    media = MediaIoBaseUpload(
+                        fh,
+                        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+                        chunksize=UPLOAD_CHUNK_SIZE if resumable else -1,
+                        resumable=resumable
+                    )
+                    
+                    params = {
+                        'body': file_metadata,
+                        'media_body': media,
+                        'fields': 'id',
+                        'supportsAllDrives': True,  # Shared Drive 지원 필수
+                    }
+                    
+                    file = self.drive.files().create(**params).execute()
                 file_id = file.get('id')
                 
-                print(f"  ✅ Google Drive 업로드 완료: {file_name}")
-                print(f"     파일 ID: {file_id}")
-                print(f"     링크: {file.get('webViewLink', 'N/A')}")
+                snapshot = self._section_snapshots.get(section_folder_name)
+                if snapshot is not None:
+                    snapshot[file_name] = file_id
+                
+                logger.info(f"  ✅ Google Drive 업로드 완료: {file_name}")
+                logger.info(f"     파일 ID: {file_id}")
+                logger.info(f"     링크: https://drive.google.com/file/d/{file_id}/view")
                 
                 return file_id
                 
             except HttpError as e:
                 error_details = e.error_details if hasattr(e, 'error_details') else []
-                print(f"  ❌ 파일 업로드 실패 (시도 {attempt}/{max_retries}): {e}")
+                logger.error(f"  ❌ 파일 업로드 실패 (시도 {attempt}/{max_retries}): {e}")
                 
                 if e.resp.status == 404:
-                    print("     파일을 찾을 수 없습니다.")
+                    logger.error("     파일을 찾을 수 없습니다.")
+                    # 저장된 폴더 ID가 더 이상 유효하지 않을 수 있으므로 캐시를 비우고 다시 찾는다
+                    self.invalidate_path_cache()
+                    if attempt < max_retries and section_folder_name:
+                        section_folder_id = None
+                        continue
                     return None
                 elif e.resp.status == 403:
-                    print("     권한이 없습니다. Shared Drive 멤버 권한을 확인하세요.")
-                    print(f"     상세: {error_details}")
-                    return None
-                elif e.resp.status == 429:
-                    # Rate limit - 재시도
-                    wait_time = 2 ** attempt
-                    print(f"     Rate limit 도달. {wait_time}초 후 재시도...")
-                    if attempt < max_retries:
-                        import time
-                        time.sleep(wait_time)
-                        continue
+                    logger.error("     권한이 없습니다. Shared Drive 멤버 권한을 확인하세요.")
+                    logger.error(f"     상세: {error_details}")
                     return None
-                elif e.resp.status >= 500:
-                    # 서버 오류 - 재시도
-                    wait_time = 2 ** attempt
-                    print(f"     서버 오류 (HTTP {e.resp.status}). {wait_time}초 후 재시도...")
+                elif e.resp.status in RETRY_STATUS:
+                    # Rate limit / 서버 오류 - 재시도
+                    wait_time = _retry_delay(e, attempt)
+                    if e.resp.status == 429:
+                        logger.warning(f"     Rate limit 도달. {wait_time:.1f}초 후 재시도...")
+                    else:
+                        logger.warning(f"     서버 오류 (HTTP {e.resp.status}). {wait_time:.1f}초 후 재시도...")
                     if attempt < max_retries:
-                        import time
                         time.sleep(wait_time)
                         continue
                     return None
                 else:
-                    print(f"     HTTP 상태 코드: {e.resp.status}")
-                    print(f"     상세: {error_details}")
+                    logger.error(f"     HTTP 상태 코드: {e.resp.status}")
+                    logger.error(f"     상세: {error_details}")
                     if attempt < max_retries:
-                        import time
                         time.sleep(2 ** attempt)
                         continue
                     return None
                     
-            except Exception as e:
-                print(f"  ❌ 업로드 중 오류 발생 (시도 {attempt}/{max_retries}): {e}")
-                import traceback
-                print(f"  [ERROR] 상세:")
-                traceback.print_exc()
+            except Exception:
+                logger.exception("  ❌ 업로드 중 오류 발생 (시도 %d/%d)", attempt, max_retries)
                 
                 if attempt < max_retries:
                     wait_time = 2 ** attempt
-                    print(f"  ⏳ {wait_time}초 후 재시도...")
-                    import time
+                    logger.warning(f"  ⏳ {wait_time}초 후 재시도...")
                     time.sleep(wait_time)
                     continue
                 return None
         
-        print(f"  ❌ {max_retries}회 시도 모두 실패")
+        logger.error(f"  ❌ {max_retries}회 시도 모두 실패")
         return None
     
+    def upload_files(self, jobs: List[Tuple[Path, str, str]], max_workers: int = 4) -> Dict[str, Optional[str]]:
+        """여러 파일 병렬 업로드
+
+        jobs: (로컬 파일 경로, 파일명, 섹션 폴더명) 목록
+        반환: 파일명 -> 업로드된 파일 ID (실패 시 None)
+        """
+        if not self._ensure_service():
+            logger.error("❌ Drive 서비스가 초기화되지 않았습니다.")
+            return {file_name: None for _, file_name, _ in jobs}
+        
+        def _run(job):
+            local_file_path, file_name, section_folder_name = job
+            self._rate_limiter.wait()
+            return self.upload_file(local_file_path, file_name, section_folder_name)
+        
+        results: Dict[str, Optional[str]] = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(_run, job): job[1] for job in jobs}
+            for future in as_completed(futures):
+                file_name = futures[future]
+                try:
+                    results[file_name] = future.result()
+                except Exception as e:
+                    logger.error(f"  ❌ 업로드 중 오류 발생: {file_name}: {e}")
+                    results[file_name] = None
+        
+        ok = sum(1 for v in results.values() if v)
+        logger.info(f"  📊 병렬 업로드 완료: 성공 {ok}개 / 전체 {len(jobs)}개")
+        return results
+    
     def get_all_file_months(self, section_folder_name: str) -> set:
         """섹션 폴더에서 모든 파일의 년월을 set으로 반환 (예: {(2024, 12), (2024, 11), ...})"""
         try:
@@ -338,42 +642,12 @@ class DriveUploader:
             if not section_folder_id:
                 return set()
             
-            # 모든 파일 검색 (페이지네이션 처리)
-            all_items = []
-            page_token = None
-            
-            while True:
-                query = f"'{section_folder_id}' in parents and trashed=false and mimeType!='application/vnd.google-apps.folder'"
-                
-                params = {
-                    'q': query,
-                    'fields': 'nextPageToken, files(id, name)',
-                    'pageSize': 1000,  # 최대 1000개
-                    'supportsAllDrives': True,
-                    'includeItemsFromAllDrives': True,
-                }
-                
-                if page_token:
-                    params['pageToken'] = page_token
-                
-                results = self.drive.files().list(**params).execute()
-                items = results.get('files', [])
-                all_items.extend(items)
-                
-                page_token = results.get('nextPageToken')
-                if not page_token:
-                    break
-            
-            if not all_items:
-                return set()
-            
-            # 파일명에서 년월 추출
-            import re
+            # 모든 파일 검색 (페이지 단위로 받으면서 바로 년월 추출)
+            query = f"'{section_folder_id}' in parents and trashed=false and mimeType!='application/vnd.google-apps.folder'"
             months = set()
-            for item in all_items:
+            for item in self._iter_files(query, 'files(name)'):
                 name = item.get('name', '')
-                # 파일명 형식: "{섹션명} YYYYMM.xlsx"
-                match = re.search(r'(\d{4})(\d{2})\.xlsx', name)
+                match = _MONTH_RE.search(name)
                 if match:
                     year = int(match.group(1))
                     month = int(match.group(2))
@@ -382,7 +656,7 @@ class DriveUploader:
             return months
             
         except Exception as e:
-            print(f"  ⚠️  파일 목록 확인 실패: {e}")
+            logger.warning(f"  ⚠️  파일 목록 확인 실패: {e}")
             return set()
     
     def get_last_file_month(self, section_folder_name: str) -> Optional[Tuple[int, int]]:
@@ -392,78 +666,240 @@ class DriveUploader:
             return None
         return max(all_months)  # 가장 최근 년월 반환
     
-    def check_file_exists(self, file_name: str, section_folder_name: str) -> bool:
-        """파일이 이미 존재하는지 확인"""
+    def snapshot_section(self, section_folder_name: str) -> Dict[str, str]:
+        """섹션 폴더 전체 파일 목록을 한 번 조회해 {파일명: 파일ID}로 보관
+
+        이후 check_file_exists()/existing_files()는 API 호출 없이 이 목록을 사용한다.
+        """
+        snapshot: Dict[str, str] = {}
         try:
-            # 부모 폴더 경로 확인
-            print(f"  [DEBUG] 폴더 경로 확인 시작...")
             path_ids = self.get_folder_path_ids()
             if not path_ids:
-                print(f"  ⚠️  폴더 경로를 찾을 수 없습니다")
-                return False
-            print(f"  [DEBUG] 폴더 경로 확인 완료: {path_ids}")
+                return snapshot
             
-            # 섹션별 폴더 찾기
-            # PARENT_FOLDER_PATH[-1] = "부동산 실거래자료" 폴더 ID
             section_parent_id = path_ids[PARENT_FOLDER_PATH[-1]]
-            if not section_parent_id:
-                print(f"  ⚠️  부모 폴더 ID를 찾을 수 없습니다")
-                return False
-            print(f"  [DEBUG] 부모 폴더 ID: {section_parent_id}")
+            section_folder_id = self.find_folder_by_name(section_folder_name, section_parent_id)
+            
+            if section_folder_id:
+                query = f"'{section_folder_id}' in parents and trashed=false"
+                for item in self._iter_files(query, 'files(id, name)'):
+                    snapshot.setdefault(item.get('name', ''), item.get('id'))
+            
+            self._section_snapshots[section_folder_name] = snapshot
+            logger.info(f"  📋 섹션 파일 목록 조회: {section_folder_name} ({len(snapshot)}개)")
+            return snapshot
+            
+        except Exception as e:
+            logger.warning(f"  ⚠️  섹션 파일 목록 조회 실패: {e}")
+            return snapshot
+    
+    def snapshot_sections(self, section_folder_names: List[str]) -> Dict[str, Dict[str, str]]:
+        """여러 섹션 폴더의 파일 목록을 한 번에 조회해 섹션별 스냅샷으로 보관
+
+        섹션마다 snapshot_section()을 부르는 대신 부모 폴더 조건을 OR로 묶어
+        SNAPSHOT_PARENTS_CHUNK개 폴더당 쿼리 하나로 읽고, parents로 나눠 담는다.
+        """
+        snapshots: Dict[str, Dict[str, str]] = {}
+        try:
+            path_ids = self.get_folder_path_ids()
+            if not path_ids:
+                return snapshots
+            
+            section_parent_id = path_ids[PARENT_FOLDER_PATH[-1]]
+            name_by_id = {}
+            for name in dict.fromkeys(section_folder_names):
+                folder_id = self.find_folder_by_name(name, section_parent_id)
+                if folder_id:
+                    name_by_id[folder_id] = name
+                    snapshots[name] = {}
+            
+            folder_ids = list(name_by_id)
+            for i in range(0, len(folder_ids), SNAPSHOT_PARENTS_CHUNK):
+                chunk = folder_ids[i:i + SNAPSHOT_PARENTS_CHUNK]
+                parent_conds = " or ".join(f"'{fid}' in parents" for fid in chunk)
+                query = f"({parent_conds}) and trashed=false"
+                for item in self._iter_files(query, 'files(id, name, parents)'):
+                    for parent in item.get('parents', []):
+                        if parent in name_by_id:
+                            snapshots[name_by_id[parent]].setdefault(item.get('name', ''), item.get('id'))
+            
+            self._section_snapshots.update(snapshots)
+            for name, snapshot in snapshots.items():
+                logger.info(f"  📋 섹션 파일 목록 조회: {name} ({len(snapshot)}개)")
+            return snapshots
+            
+        except Exception as e:
+            logger.warning(f"  ⚠️  섹션 파일 목록 조회 실패: {e}")
+            return snapshots
+    
+    def existing_files(self, names: List[str], section_folder_name: str) -> set:
+        """섹션 폴더에 이미 있는 파일명 set 반환 (파일명 50개씩 묶어 한 번에 조회)"""
+        snapshot = self._section_snapshots.get(section_folder_name)
+        if snapshot is not None:
+            return {n for n in names if n in snapshot}
+        
+        try:
+            path_ids = self.get_folder_path_ids()
+            if not path_ids:
+                return set()
             
-            # 섹션 폴더 찾기 (예: "아파트" 폴더)
-            print(f"  [DEBUG] 섹션 폴더 찾기: {section_folder_name}")
+            section_parent_id = path_ids[PARENT_FOLDER_PATH[-1]]
             section_folder_id = self.find_folder_by_name(section_folder_name, section_parent_id)
             
             if not section_folder_id:
-                print(f"  ℹ️  섹션 폴더를 찾을 수 없습니다: {section_folder_name} (부모: {section_parent_id})")
+                return set()
+            
+            unique_names = list(dict.fromkeys(names))
+            found = set()
+            
+            for i in range(0, len(unique_names), EXISTS_QUERY_CHUNK):
+                chunk = unique_names[i:i + EXISTS_QUERY_CHUNK]
+                name_conds = " or ".join(f"name='{_escape_query(n)}'" for n in chunk)
+                query = f"'{section_folder_id}' in parents and trashed=false and ({name_conds})"
+                found.update(item.get('name', '') for item in self._iter_files(query, 'files(name)'))
+            
+            return found
+            
+        except Exception as e:
+            logger.warning(f"  ⚠️  파일 존재 확인 실패: {e}")
+            return set()
+    
+    def get_section_folder_id(self, section_folder_name: str) -> Optional[str]:
+        """섹션 폴더 ID 찾기 (폴더 ID는 캐시되므로 반복 호출해도 API 호출 없음)
+
+        upload_file(section_folder_id=...)에 넘길 값을 얻을 때 사용.
+        """
+        # 부모 폴더 경로 확인
+        logger.debug("  [DEBUG] 폴더 경로 확인 시작...")
+        path_ids = self.get_folder_path_ids()
+        if not path_ids:
+            logger.warning(f"  ⚠️  폴더 경로를 찾을 수 없습니다")
+            return None
+        logger.debug("  [DEBUG] 폴더 경로 확인 완료: %s", path_ids)
+        
+        # 섹션별 폴더 찾기
+        # PARENT_FOLDER_PATH[-1] = "부동산 실거래자료" 폴더 ID
+        section_parent_id = path_ids[PARENT_FOLDER_PATH[-1]]
+        if not section_parent_id:
+            logger.warning(f"  ⚠️  부모 폴더 ID를 찾을 수 없습니다")
+            return None
+        logger.debug("  [DEBUG] 부모 폴더 ID: %s", section_parent_id)
+        
+        # 섹션 폴더 찾기 (예: "아파트" 폴더)
+        logger.debug("  [DEBUG] 섹션 폴더 찾기: %s", section_folder_name)
+        section_folder_id = self.find_folder_by_name(section_folder_name, section_parent_id)
+        
+        if not section_folder_id:
+            logger.info(f"  ℹ️  섹션 폴더를 찾을 수 없습니다: {section_folder_name} (부모: {section_parent_id})")
+            return None
+        logger.debug("  [DEBUG] 섹션 폴더 ID: %s", section_folder_id)
+        return section_folder_id
+    
+    def check_file_exists(self, file_name: str, section_folder_name: str) -> bool:
+        """파일이 이미 존재하는지 확인"""
+        snapshot = self._section_snapshots.get(section_folder_name)
+        if snapshot is not None:
+            return file_name in snapshot
+        
+        try:
+            section_folder_id = self.get_section_folder_id(section_folder_name)
+            if not section_folder_id:
                 return False
-            print(f"  [DEBUG] 섹션 폴더 ID: {section_folder_id}")
             
             # 파일 검색
-            query = f"name='{file_name}' and '{section_folder_id}' in parents and trashed=false"
-            print(f"  [DEBUG] 파일 검색 쿼리: {query}")
+            query = f"name='{_escape_query(file_name)}' and '{section_folder_id}' in parents and trashed=false"
+            logger.debug("  [DEBUG] 파일 검색 쿼리: %s", query)
             
-            params = {
-                'q': query,
-                'fields': 'files(id, name)',
-                'supportsAllDrives': True,
-                'includeItemsFromAllDrives': True,
-            }
-            
-            print(f"  [DEBUG] API 호출 파라미터: {params}")
-            print(f"  [DEBUG] driveId 파라미터 확인: {'driveId' in params}")
+            params = self._list_params(query, 'files(id)', page_size=1)
             
-            # files().list()에서 Shared Drive 검색 시
-            # supportsAllDrives와 includeItemsFromAllDrives만으로 충분
-            # driveId 파라미터는 사용하지 않음
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("  [DEBUG] API 호출 파라미터: %s (driveId: %s)", params, 'driveId' in params)
             
-            results = self.drive.files().list(**params).execute()
+            results = self._execute_with_retry(self.drive.files().list(**params))
             items = results.get('files', [])
             
             found = len(items) > 0
             if found:
-                print(f"  ✅ 파일 존재 확인: {file_name} (섹션: {section_folder_name})")
+                logger.info(f"  ✅ 파일 존재 확인: {file_name} (섹션: {section_folder_name})")
             
             return found
             
-        except Exception as e:
-            print(f"  ⚠️  파일 존재 확인 실패: {e}")
-            print(f"  [ERROR] 예외 타입: {type(e).__name__}")
-            import traceback
-            print("  [ERROR] 전체 traceback:")
-            traceback.print_exc()
+        except Exception:
+            logger.exception("  ⚠️  파일 존재 확인 실패: %s (섹션: %s)", file_name, section_folder_name)
             return False
 
 
+class AsyncDriveUploader:
+    """백그라운드 스레드에서 업로드하는 DriveUploader 래퍼
+
+    엑셀 생성(호출 측)과 Drive 업로드를 겹쳐서 실행하기 위해 사용.
+    submit()은 바로 Future를 반환하고, 업로드는 큐 순서대로 처리된다.
+    재시도는 DriveUploader.upload_file()의 재시도 로직(최대 3회, 2**n초 대기)을 그대로 사용.
+    """
+    
+    _STOP = object()
+    
+    def __init__(self, uploader: DriveUploader = None):
+        self.uploader = uploader or get_uploader()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self._close_lock = threading.Lock()  # 종료 표시와 작업 등록이 엇갈리지 않도록
+        self._worker = threading.Thread(target=self._run, name="drive-upload", daemon=True)
+        self._worker.start()
+    
+    def submit(self, local_file_path: Path, file_name: str, section_folder_name: str) -> Future:
+        """업로드 작업 등록 (결과: 업로드된 파일 ID 또는 None)
+
+        join() 이후에는 워커가 없으므로 RuntimeError 발생
+        """
+        future: Future = Future()
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError("AsyncDriveUploader가 이미 종료되었습니다 (join 이후 submit)")
+            self._queue.put((future, local_file_path, file_name, section_folder_name))
+        return future
+    
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is self._STOP:
+                    return
+                future, local_file_path, file_name, section_folder_name = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(
+                        self.uploader.upload_file(local_file_path, file_name, section_folder_name)
+                    )
+                except Exception as e:
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
+    
+    def join(self):
+        """등록된 업로드가 모두 끝날 때까지 대기 후 워커 종료 (여러 번 호출해도 됨)"""
+        with self._close_lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(self._STOP)
+        self._worker.join()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.join()
+
+
 # 전역 인스턴스
 _uploader_instance = None
 
 def get_uploader() -> DriveUploader:
-    """DriveUploader 싱글톤 인스턴스 가져오기"""
+    """DriveUploader 싱글톤 인스턴스 가져오기 (서비스 초기화는 첫 API 호출 시)"""
     global _uploader_instance
     if _uploader_instance is None:
         _uploader_instance = DriveUploader()
-        _uploader_instance.init_service()
+        atexit.register(_uploader_instance.save_folder_cache)
     return _uploader_instance
 
@@ -108,7 +108,7 @@ def create_folder(service, folder_name: str, parent_folder_id: str = None) -> st
         
         folder = service.files().create(
             body=file_metadata,
-            fields='id, name',
+            fields='id',
             supportsAllDrives=True,
             driveId=SHARED_DRIVE_ID,
         ).execute()
@@ -129,6 +129,75 @@ def get_or_create_folder(service, folder_name: str, parent_folder_id: str = None
     return create_folder(service, folder_name, parent_folder_id)
 
 
+def find_folders_batch(service, folder_names: list, parent_folder_id: str) -> dict:
+    """여러 폴더를 배치 요청 한 번으로 찾기 (폴더명 -> 폴더 ID)"""
+    found = {}
+
+    def collect(request_id, response, exception):
+        if exception is not None:
+            # 검색 실패한 폴더는 중복 생성되지 않도록 None으로 표시
+            print(f"  ❌ 폴더 검색 실패: {request_id} ({exception})")
+            found[request_id] = None
+            return
+        items = response.get('files', [])
+        if items:
+            found[request_id] = items[0]['id']
+            print(f"  ✅ 폴더 찾음: {request_id} (ID: {items[0]['id']})")
+
+    batch = service.new_batch_http_request(callback=collect)
+    for folder_name in folder_names:
+        safe_name = folder_name.replace("'", "\\'")
+        query = (
+            f"name='{safe_name}' and mimeType='application/vnd.google-apps.folder' "
+            f"and trashed=false and '{parent_folder_id}' in parents"
+        )
+        batch.add(
+            service.files().list(
+                q=query,
+                fields='files(id)',
+                pageSize=1,
+                supportsAllDrives=True,
+                includeItemsFromAllDrives=True,
+                driveId=SHARED_DRIVE_ID,
+                corpora='drive',
+            ),
+            request_id=folder_name,
+        )
+    batch.execute()
+    return found
+
+
+def create_folders_batch(service, folder_names: list, parent_folder_id: str) -> dict:
+    """여러 폴더를 배치 요청 한 번으로 생성 (폴더명 -> 폴더 ID)"""
+    created = {}
+    if not folder_names:
+        return created
+
+    def collect(request_id, response, exception):
+        if exception is not None:
+            print(f"  ❌ 폴더 생성 실패: {request_id} ({exception})")
+            return
+        created[request_id] = response.get('id')
+        print(f"  ✅ 폴더 생성 완료: {request_id} (ID: {response.get('id')})")
+
+    batch = service.new_batch_http_request(callback=collect)
+    for folder_name in folder_names:
+        batch.add(
+            service.files().create(
+                body={
+                    'name': folder_name,
+                    'mimeType': 'application/vnd.google-apps.folder',
+                    'parents': [parent_folder_id],
+                },
+                fields='id',
+                supportsAllDrives=True,
+            ),
+            request_id=folder_name,
+        )
+    batch.execute()
+    return created
+
+
 def main():
     """메인 함수"""
     print("=" * 70)
@@ -160,12 +229,22 @@ def main():
     print("📁 섹션별 폴더 생성/확인")
     print("=" * 70)
     
-    folder_results = {}
-    for idx, section_name in enumerate(SECTION_FOLDERS, 1):
-        print(f"\n[{idx}/{len(SECTION_FOLDERS)}] {section_name}")
-        folder_id = get_or_create_folder(drive, section_name, parent_folder_id)
-        if folder_id:
-            folder_results[section_name] = folder_id
+    # 존재 확인 1회 + 없는 폴더 생성 1회 (섹션 수와 무관하게 배치 요청 2번)
+    try:
+        folder_results = find_folders_batch(drive, SECTION_FOLDERS, parent_folder_id)
+        missing = [name for name in SECTION_FOLDERS if name not in folder_results]
+        if missing:
+            print(f"\n  📁 폴더 생성 중: {', '.join(missing)}")
+        folder_results.update(create_folders_batch(drive, missing, parent_folder_id))
+        folder_results = {k: v for k, v in folder_results.items() if v}
+    except HttpError as e:
+        print(f"  ❌ 배치 요청 실패: {e}")
+        folder_results = {}
+        for idx, section_name in enumerate(SECTION_FOLDERS, 1):
+            print(f"\n[{idx}/{len(SECTION_FOLDERS)}] {section_name}")
+            folder_id = get_or_create_folder(drive, section_name, parent_folder_id)
+            if folder_id:
+                folder_results[section_name] = folder_id
     
     # 결과 요약
     print("\n" + "=" * 70)
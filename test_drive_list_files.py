@@ -6,6 +6,13 @@ Google Shared Drive 파일 목록 확인
 """
 import os
 import json
+import heapq
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
@@ -32,6 +39,45 @@ PARENT_FOLDER_PATH = ["부동산 실거래자료"]
 
 SCOPES = ['https://www.googleapis.com/auth/drive']
 
+# 배치 요청 1회에 담을 최대 요청 수 (Drive API 제한: 100)
+BATCH_MAX_REQUESTS = 100
+
+# 폴더 목록 동시 조회 스레드 수 / 초당 요청 수 제한 (rateLimitExceeded 방지)
+LIST_MAX_WORKERS = int(os.getenv("DRIVE_LIST_MAX_WORKERS", "10"))
+LIST_RATE_PER_SEC = float(os.getenv("DRIVE_LIST_RATE_PER_SEC", "10"))
+
+# files.list 응답 필드 (쓰는 필드만 요청해 응답 크기를 줄임, 정렬은 클라이언트에서)
+LIST_ITEM_FIELDS = 'id, name, mimeType, size, modifiedTime'   # 최상위 폴더: 폴더/파일 분류 + 출력
+FOLDER_FILE_FIELDS = 'name, size'                            # 섹션 폴더: 파일명/크기만 출력
+
+# Shared Drive ID를 알면 드라이브 전체를 한 번의 페이지 조회로 읽어 트리를 구성
+# (0으로 두면 폴더별 조회 방식 사용)
+LIST_SINGLE_QUERY = os.getenv("DRIVE_LIST_SINGLE_QUERY", "1") != "0"
+
+# 폴더 ID 캐시 파일 (drive_uploader.py와 같은 형식/경로: 부모 ID -> {폴더명: 폴더 ID})
+FOLDER_CACHE_FILE = Path(os.getenv(
+    "DRIVE_FOLDER_CACHE_FILE",
+    str(Path.home() / ".cache" / "molit_folder_cache.json")
+))
+
+# 드라이브 전체 메타데이터 캐시 + Changes 피드 토큰 (다음 실행부터는 변경분만 조회)
+DRIVE_TREE_CACHE_FILE = Path(os.getenv(
+    "DRIVE_TREE_CACHE_FILE",
+    str(Path.home() / ".cache" / "molit_drive_tree.json")
+))
+TREE_ITEM_FIELDS = 'id, name, parents, mimeType, size, modifiedTime'
+
+# 재시도할 HTTP 상태 (403은 rateLimitExceeded 계열일 때만)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+RATE_LIMIT_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+RETRY_MAX_WAIT = 60
+
+# 스레드별 서비스 생성용 인증 정보 (init_drive_service에서 설정)
+_CREDS = None
+_thread_local = threading.local()
+_pace_lock = threading.Lock()
+_next_request_at = 0.0
+
 
 def init_drive_service():
     """Google Drive API 서비스 초기화"""
@@ -53,6 +99,8 @@ def init_drive_service():
                 "또는 GOOGLE_SERVICE_ACCOUNT_JSON 환경 변수를 설정하세요."
             )
         
+        global _CREDS
+        _CREDS = creds
         service = build('drive', 'v3', credentials=creds)
         print("[OK] Google Drive API 서비스 초기화 완료")
         return service
@@ -61,6 +109,88 @@ def init_drive_service():
         raise
 
 
+def _thread_service(default_service):
+    """스레드별 Drive 서비스 (httplib2.Http는 스레드 안전하지 않음)"""
+    if _CREDS is None:
+        return default_service
+    service = getattr(_thread_local, 'service', None)
+    if service is None:
+        service = build('drive', 'v3', credentials=_CREDS)
+        _thread_local.service = service
+    return service
+
+
+def _pace():
+    """초당 LIST_RATE_PER_SEC 요청을 넘지 않도록 대기"""
+    global _next_request_at
+    if LIST_RATE_PER_SEC <= 0:
+        return
+    with _pace_lock:
+        now = time.monotonic()
+        wait = _next_request_at - now
+        _next_request_at = max(now, _next_request_at) + 1.0 / LIST_RATE_PER_SEC
+    if wait > 0:
+        time.sleep(wait)
+
+
+def _is_retryable(e: HttpError) -> bool:
+    status = e.resp.status if e.resp is not None else None
+    if status in RETRY_STATUS:
+        return True
+    if status == 403:
+        try:
+            errors = json.loads(e.content).get('error', {}).get('errors', [])
+        except (ValueError, AttributeError):
+            return False
+        return any(err.get('reason') in RATE_LIMIT_REASONS for err in errors)
+    return False
+
+
+def _execute_with_retry(request, max_attempts: int = 5):
+    """API 요청 실행 (rate limit/5xx는 지수 백오프 + 지터 후 재시도)"""
+    for attempt in range(1, max_attempts + 1):
+        try:
+            return request.execute()
+        except HttpError as e:
+            if not _is_retryable(e) or attempt == max_attempts:
+                raise
+            wait_time = min(2 ** attempt + random.random(), RETRY_MAX_WAIT)
+            print(f"  [WARNING] HTTP {e.resp.status}, {wait_time:.1f}초 후 재시도 ({attempt}/{max_attempts})...")
+            time.sleep(wait_time)
+
+
+def load_folder_cache() -> dict:
+    """디스크에 저장된 폴더 ID 캐시 읽기"""
+    try:
+        data = json.loads(FOLDER_CACHE_FILE.read_text(encoding='utf-8'))
+        if isinstance(data, dict):
+            # 예전 버전이 폴더 캐시에 넣어 두던 드라이브 ID 항목은 무시
+            return {k: dict(v) for k, v in data.items()
+                    if isinstance(v, dict) and k != "__drive_ids__"}
+    except (OSError, ValueError):
+        pass
+    return {}
+
+
+def save_folder_cache(cache: dict):
+    """폴더 ID 캐시를 디스크에 저장"""
+    try:
+        FOLDER_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        FOLDER_CACHE_FILE.write_text(json.dumps(cache, ensure_ascii=False), encoding='utf-8')
+    except OSError as e:
+        print(f"  [WARNING] 폴더 캐시 저장 실패: {e}")
+
+
+_folder_cache = None
+
+
+def _get_folder_cache() -> dict:
+    global _folder_cache
+    if _folder_cache is None:
+        _folder_cache = load_folder_cache()
+    return _folder_cache
+
+
 def list_drives(service):
     """Shared Drive 목록 조회"""
     try:
@@ -88,7 +218,12 @@ def list_drives(service):
 
 
 def find_folder_by_name(service, folder_name: str, parent_folder_id: str = None):
-    """폴더 이름으로 폴더 ID 찾기"""
+    """폴더 이름으로 폴더 ID 찾기 (캐시에 있으면 API 호출 생략)"""
+    cache = _get_folder_cache()
+    cached_id = cache.get(parent_folder_id or 'root', {}).get(folder_name)
+    if cached_id:
+        return {'id': cached_id, 'name': folder_name}
+    
     try:
         query = f"name='{folder_name}' and mimeType='application/vnd.google-apps.folder' and trashed=false"
         if parent_folder_id:
@@ -96,7 +231,7 @@ def find_folder_by_name(service, folder_name: str, parent_folder_id: str = None)
         
         params = {
             'q': query,
-            'fields': 'files(id, name, parents, driveId)',
+            'fields': 'files(id, name)',
             'supportsAllDrives': True,
             'includeItemsFromAllDrives': True,
         }
@@ -105,10 +240,12 @@ def find_folder_by_name(service, folder_name: str, parent_folder_id: str = None)
         # 해당 폴더 내에서만 검색하므로 driveId 불필요
         # supportsAllDrives와 includeItemsFromAllDrives만으로 충분
         
-        results = service.files().list(**params).execute()
+        results = _execute_with_retry(service.files().list(**params))
         items = results.get('files', [])
         
         if items:
+            cache.setdefault(parent_folder_id or 'root', {})[folder_name] = items[0]['id']
+            save_folder_cache(cache)
             return items[0]
         return None
     except HttpError as e:
@@ -116,35 +253,250 @@ def find_folder_by_name(service, folder_name: str, parent_folder_id: str = None)
         return None
 
 
-def list_files_in_folder(service, folder_id: str, folder_name: str = "", max_results: int = 100):
-    """폴더 내 파일 목록 조회"""
+def iter_files_in_folder(service, folder_id: str, page_size: int = 1000, page_token: str = None,
+                         fields: str = LIST_ITEM_FIELDS):
+    """폴더 내 파일을 페이지 단위로 끝까지 조회하는 제너레이터 (nextPageToken 처리)"""
+    params = {
+        'q': f"'{folder_id}' in parents and trashed=false",
+        'fields': f'nextPageToken, files({fields})',
+        'pageSize': page_size,
+        'supportsAllDrives': True,
+        'includeItemsFromAllDrives': True,
+    }
+    if page_token:
+        params['pageToken'] = page_token
+    
+    # files().list()에서 특정 폴더 내 검색 시
+    # supportsAllDrives와 includeItemsFromAllDrives만으로 충분
+    # driveId 파라미터는 사용하지 않음
+    request = service.files().list(**params)
+    while request is not None:
+        _pace()
+        results = _execute_with_retry(request)
+        yield from results.get('files', [])
+        request = service.files().list_next(request, results)
+
+
+def list_files_in_folder(service, folder_id: str, folder_name: str = "", max_results: int = 100,
+                         fields: str = LIST_ITEM_FIELDS):
+    """폴더 내 파일 목록 조회 (max_results는 페이지 크기, 모든 페이지를 읽음)"""
     try:
-        query = f"'{folder_id}' in parents and trashed=false"
-        
+        return list(iter_files_in_folder(service, folder_id, page_size=max_results, fields=fields))
+    except HttpError as e:
+        print(f"  [ERROR] 파일 목록 조회 실패: {e}")
+        return []
+
+
+def list_files_in_folders_batch(service, folders: list, max_results: int = 1000,
+                                fields: str = FOLDER_FILE_FIELDS) -> dict:
+    """여러 폴더의 파일 목록을 배치 요청으로 조회 (폴더 ID -> 파일 목록)"""
+    results = {}
+    results_lock = threading.Lock()
+    next_pages = {}
+
+    def collect(request_id, response, exception):
+        if isinstance(exception, HttpError) and _is_retryable(exception):
+            # 결과에서 빼 두면 호출 측에서 재시도 포함 개별 조회로 다시 가져옴
+            return
+        if exception is not None:
+            print(f"  [ERROR] 파일 목록 조회 실패 ({request_id}): {exception}")
+            files = []
+        else:
+            files = response.get('files', [])
+            if response.get('nextPageToken'):
+                next_pages[request_id] = response['nextPageToken']
+        with results_lock:
+            results[request_id] = files
+
+    def run_batch(chunk):
+        batch_service = _thread_service(service)
+        batch = batch_service.new_batch_http_request(callback=collect)
+        for folder in chunk:
+            batch.add(
+                batch_service.files().list(
+                    q=f"'{folder.get('id')}' in parents and trashed=false",
+                    fields=f'nextPageToken, files({fields})',
+                    pageSize=max_results,
+                    supportsAllDrives=True,
+                    includeItemsFromAllDrives=True,
+                ),
+                request_id=folder.get('id'),
+            )
+        _pace()
+        try:
+            batch.execute()
+        except HttpError as e:
+            print(f"  [ERROR] 배치 요청 실패: {e}")
+
+    chunks = [folders[i:i + BATCH_MAX_REQUESTS] for i in range(0, len(folders), BATCH_MAX_REQUESTS)]
+    if len(chunks) <= 1:
+        for chunk in chunks:
+            run_batch(chunk)
+        _fetch_remaining_pages(service, results, next_pages, max_results, fields)
+        return results
+
+    # 배치가 여러 개면 스레드별 서비스로 동시에 전송
+    with ThreadPoolExecutor(max_workers=min(LIST_MAX_WORKERS, len(chunks))) as ex:
+        for future in as_completed([ex.submit(run_batch, chunk) for chunk in chunks]):
+            future.result()
+    _fetch_remaining_pages(service, results, next_pages, max_results, fields)
+    return results
+
+
+def _fetch_remaining_pages(service, results: dict, next_pages: dict, page_size: int, fields: str):
+    """배치 응답에서 잘린 폴더는 나머지 페이지를 이어서 조회"""
+    for folder_id, page_token in next_pages.items():
+        try:
+            results[folder_id].extend(
+                iter_files_in_folder(service, folder_id, page_size=page_size,
+                                     page_token=page_token, fields=fields)
+            )
+        except HttpError as e:
+            print(f"  [ERROR] 파일 목록 조회 실패 ({folder_id}): {e}")
+
+
+def list_files_in_folders(service, folders: list, max_results: int = 1000,
+                          fields: str = FOLDER_FILE_FIELDS) -> dict:
+    """여러 폴더의 파일 목록을 스레드 풀로 동시에 개별 조회 (폴더 ID -> 파일 목록)"""
+    results = {}
+    if not folders:
+        return results
+
+    def worker(folder):
+        return list_files_in_folder(
+            _thread_service(service), folder.get('id'), folder.get('name', ''), max_results, fields
+        )
+
+    with ThreadPoolExecutor(max_workers=min(LIST_MAX_WORKERS, len(folders))) as ex:
+        futures = {ex.submit(worker, folder): folder for folder in folders}
+        for future in as_completed(futures):
+            results[futures[future].get('id')] = future.result()
+    return results
+
+
+def _scan_drive_files(service, drive_id: str) -> dict:
+    """Shared Drive 전체를 페이지 단위로 조회 (파일 ID -> 메타데이터)"""
+    files = {}
+    page_token = None
+    while True:
         params = {
-            'q': query,
-            'fields': 'files(id, name, mimeType, size, modifiedTime, driveId)',
-            'pageSize': max_results,
-            'orderBy': 'name',
+            'q': "trashed=false",
+            'fields': f'nextPageToken, files({TREE_ITEM_FIELDS})',
+            'pageSize': 1000,
+            'corpora': 'drive',
+            'driveId': drive_id,
             'supportsAllDrives': True,
             'includeItemsFromAllDrives': True,
         }
-        
-        # files().list()에서 특정 폴더 내 검색 시
-        # supportsAllDrives와 includeItemsFromAllDrives만으로 충분
-        # driveId 파라미터는 사용하지 않음
-        
-        results = service.files().list(**params).execute()
-        items = results.get('files', [])
-        
-        return items
+        if page_token:
+            params['pageToken'] = page_token
+        _pace()
+        results = _execute_with_retry(service.files().list(**params))
+        for item in results.get('files', []):
+            files[item['id']] = item
+        page_token = results.get('nextPageToken')
+        if not page_token:
+            return files
+
+
+def _apply_drive_changes(service, drive_id: str, files: dict, page_token: str):
+    """저장된 토큰 이후의 변경분을 files에 반영하고 새 시작 토큰 반환
+
+    응답에 다음 토큰이 없으면 None 반환 (호출 측에서 전체 재조회)
+    """
+    while True:
+        _pace()
+        results = _execute_with_retry(service.changes().list(
+            pageToken=page_token,
+            driveId=drive_id,
+            pageSize=1000,
+            supportsAllDrives=True,
+            includeItemsFromAllDrives=True,
+            fields=f'nextPageToken, newStartPageToken, '
+                   f'changes(changeType, fileId, removed, file({TREE_ITEM_FIELDS}, trashed))',
+        ))
+        for change in results.get('changes', []):
+            if change.get('changeType', 'file') != 'file':
+                continue
+            item = change.get('file')
+            if change.get('removed') or not item or item.pop('trashed', False):
+                files.pop(change.get('fileId'), None)
+            else:
+                files[item['id']] = item
+        if results.get('newStartPageToken'):
+            return results['newStartPageToken']
+        page_token = results.get('nextPageToken')
+        if not page_token:
+            return None
+
+
+def list_drive_tree(service, drive_id: str):
+    """Shared Drive 전체 트리를 부모 ID -> 자식 목록으로 구성
+
+    첫 실행은 전체 조회, 이후 실행은 Changes 피드로 변경분만 반영 (캐시 파일 사용)
+    실패 시 None 반환 (폴더별 조회 방식으로 대체)
+    """
+    try:
+        cached = json.loads(DRIVE_TREE_CACHE_FILE.read_text(encoding='utf-8'))
+        if not isinstance(cached, dict) or cached.get('drive_id') != drive_id:
+            cached = None
+    except (OSError, ValueError):
+        cached = None
+    
+    page_token = None
+    if cached and cached.get('page_token') and isinstance(cached.get('files'), dict):
+        files = cached['files']
+        try:
+            page_token = _apply_drive_changes(service, drive_id, files, cached['page_token'])
+        except HttpError as e:
+            print(f"  [WARNING] 변경분 조회 실패: {e}")
+        if page_token:
+            print(f"  [INFO] 드라이브 캐시 사용 (변경분만 조회): {len(files)}개 항목")
+        else:
+            # 토큰 만료/오류 시 캐시를 버리고 전체 조회 (다음 실행이 같은 실패를 반복하지 않도록)
+            print("  [INFO] 드라이브 캐시 폐기 후 전체 조회")
+            try:
+                DRIVE_TREE_CACHE_FILE.unlink()
+            except OSError:
+                pass
+    
+    try:
+        if not page_token:
+            # 전체 조회 전에 토큰을 받아 두어야 조회 중 생긴 변경도 다음 실행에 반영됨
+            _pace()
+            page_token = _execute_with_retry(service.changes().getStartPageToken(
+                driveId=drive_id, supportsAllDrives=True
+            )).get('startPageToken')
+            files = _scan_drive_files(service, drive_id)
     except HttpError as e:
-        print(f"  [ERROR] 파일 목록 조회 실패: {e}")
-        return []
+        print(f"  [ERROR] 드라이브 전체 조회 실패: {e}")
+        return None
+    
+    try:
+        # 전체 JSON 문자열을 메모리에 만들지 않고 파일로 바로 직렬화, 임시 파일로 쓴 뒤 교체
+        DRIVE_TREE_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = DRIVE_TREE_CACHE_FILE.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as fp:
+            json.dump(
+                {'drive_id': drive_id, 'page_token': page_token, 'files': files},
+                fp, ensure_ascii=False, separators=(',', ':')
+            )
+        os.replace(tmp_path, DRIVE_TREE_CACHE_FILE)
+    except OSError as e:
+        print(f"  [WARNING] 드라이브 캐시 저장 실패: {e}")
+    
+    children_by_parent = {}
+    for item in files.values():
+        for parent_id in item.get('parents', []):
+            children_by_parent.setdefault(parent_id, []).append(item)
+    return children_by_parent
 
 
 def format_size(size_bytes):
-    """파일 크기 포맷팅"""
+    """파일 크기 포맷팅 (Drive API의 문자열 size도 그대로 받음)"""
+    if not size_bytes:
+        return "N/A"
+    size_bytes = int(size_bytes)
     if not size_bytes:
         return "N/A"
     for unit in ['B', 'KB', 'MB', 'GB']:
@@ -158,9 +510,17 @@ def main():
     """메인 함수"""
     import sys
     import io
-    # UTF-8 인코딩 설정
-    if sys.stdout.encoding != 'utf-8':
-        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    import atexit
+    # UTF-8 인코딩 설정 + 줄 단위 flush 없이 버퍼링 (파일 수만큼 write 시스템 호출이 나가지 않도록)
+    # VERBOSE=1 이면 기존처럼 줄 단위로 바로 출력
+    sys.stdout.flush()
+    sys.stdout = io.TextIOWrapper(
+        sys.stdout.buffer,
+        encoding='utf-8',
+        line_buffering=os.getenv("VERBOSE") == "1",
+        write_through=False,
+    )
+    atexit.register(sys.stdout.flush)
     
     print("=" * 70)
     print("Google Shared Drive 파일 목록 확인")
@@ -179,14 +539,15 @@ def main():
     print("부동산자료 폴더 확인")
     print("=" * 70)
     
+    global SHARED_DRIVE_ID
     try:
-        folder_info = drive.files().get(
+        # 접근 확인이 이 스크립트의 목적이므로 캐시하지 않고 매번 실제로 조회
+        folder_info = _execute_with_retry(drive.files().get(
             fileId=GDRIVE_FOLDER_ID,
             fields='id, name, driveId',
             supportsAllDrives=True
-        ).execute()
+        ))
         
-        global SHARED_DRIVE_ID
         if folder_info.get('driveId'):
             SHARED_DRIVE_ID = folder_info.get('driveId')
         
@@ -220,14 +581,27 @@ def main():
     all_files = []
     all_folders = []
     
-    items = list_files_in_folder(drive, final_folder_id, final_folder_name, max_results=1000)
+    children_by_parent = None
+    if LIST_SINGLE_QUERY and SHARED_DRIVE_ID:
+        children_by_parent = list_drive_tree(drive, SHARED_DRIVE_ID)
+    
+    if children_by_parent is not None:
+        items = children_by_parent.get(final_folder_id, [])
+    else:
+        items = list_files_in_folder(drive, final_folder_id, final_folder_name, max_results=1000)
     
+    # 페이지 단위로 읽은 항목을 폴더/파일로 분류
     for item in items:
         if item.get('mimeType') == 'application/vnd.google-apps.folder':
             all_folders.append(item)
         else:
             all_files.append(item)
     
+    # 이름순 정렬은 한 번만 (폴더 목록/섹션별 출력 모두 이 순서를 그대로 사용)
+    by_name = lambda x: x.get('name', '')
+    all_folders.sort(key=by_name)
+    all_files.sort(key=by_name)
+    
     print(f"\n[통계]")
     print(f"  - 폴더: {len(all_folders)}개")
     print(f"  - 파일: {len(all_files)}개")
@@ -236,7 +610,7 @@ def main():
     # 폴더 목록
     if all_folders:
         print("[폴더 목록]")
-        for folder in sorted(all_folders, key=lambda x: x.get('name', '')):
+        for folder in all_folders:
             print(f"  - {folder.get('name')} (ID: {folder.get('id')})")
         print()
         
@@ -244,22 +618,29 @@ def main():
         print("=" * 70)
         print("각 섹션별 폴더 내 파일 확인")
         print("=" * 70)
-        for folder in sorted(all_folders, key=lambda x: x.get('name', '')):
+        if children_by_parent is not None:
+            # 이미 읽어 둔 드라이브 트리에서 바로 조회
+            folder_files = {f.get('id'): children_by_parent.get(f.get('id'), []) for f in all_folders}
+        else:
+            # 폴더별 조회를 배치 요청으로 묶어 왕복 횟수를 줄임
+            folder_files = list_files_in_folders_batch(drive, all_folders, max_results=1000)
+            # 배치에서 누락된 폴더는 동시에 개별 조회
+            missing_folders = [f for f in all_folders if f.get('id') not in folder_files]
+            folder_files.update(list_files_in_folders(drive, missing_folders, max_results=1000))
+        for folder in all_folders:
             folder_name = folder.get('name')
             folder_id = folder.get('id')
             print(f"\n[{folder_name}] 폴더 내 파일:")
-            folder_items = list_files_in_folder(drive, folder_id, folder_name, max_results=1000)
+            folder_items = folder_files.get(folder_id, [])
             if folder_items:
-                # 파일명으로 정렬
-                sorted_items = sorted(folder_items, key=lambda x: x.get('name', ''))
-                print(f"  총 {len(sorted_items)}개 파일")
-                # 처음 10개만 출력
-                for item in sorted_items[:10]:
+                print(f"  총 {len(folder_items)}개 파일")
+                # 파일명 순으로 처음 10개만 출력 (전체 정렬 없이 상위 10개만 선택)
+                for item in heapq.nsmallest(10, folder_items, key=by_name):
                     name = item.get('name')
-                    size = format_size(int(item.get('size', 0)) if item.get('size') else 0)
+                    size = format_size(item.get('size'))
                     print(f"    - {name} ({size})")
-                if len(sorted_items) > 10:
-                    print(f"    ... 외 {len(sorted_items) - 10}개")
+                if len(folder_items) > 10:
+                    print(f"    ... 외 {len(folder_items) - 10}개")
             else:
                 print("  (파일 없음)")
     
@@ -268,28 +649,20 @@ def main():
         print("[파일 목록]")
         
         # 파일명으로 그룹화 (섹션별)
-        sections = {}
+        sections = defaultdict(list)
         for file in all_files:
-            name = file.get('name', '')
             # 파일명에서 섹션 추출 (예: "아파트 200601.xlsx" -> "아파트")
-            if ' ' in name:
-                section = name.split(' ')[0]
-                if section not in sections:
-                    sections[section] = []
-                sections[section].append(file)
-            else:
-                if '기타' not in sections:
-                    sections['기타'] = []
-                sections['기타'].append(file)
+            section, sep, _ = file.get('name', '').partition(' ')
+            sections[section if sep else '기타'].append(file)
         
         # 섹션별 출력
         for section in sorted(sections.keys()):
             files = sections[section]
             print(f"\n  [{section}] - {len(files)}개 파일")
-            for file in sorted(files, key=lambda x: x.get('name', '')):
+            for file in files:
                 name = file.get('name')
-                size = format_size(int(file.get('size', 0)) if file.get('size') else 0)
-                modified = file.get('modifiedTime', 'N/A')[:10] if file.get('modifiedTime') else 'N/A'
+                size = format_size(file.get('size'))
+                modified = (file.get('modifiedTime') or 'N/A')[:10]
                 print(f"    - {name} ({size}, 수정: {modified})")
     
     print("\n" + "=" * 70)